@@ -2,10 +2,53 @@
 Pycory: A Colorful Library
 
 Provides some features useful for scripts for Chicory
+
+Submodules are only imported when first used (e.g pycory.path), so `import pycory` is quick.
 """
 
 __version__ = "0.0.0a"
 
-from .editstrucs import *
-from . import path
-from . import decode
+import sys as _sys
+
+__all__ = ( # Same names `from pycory import *` gave before submodules were lazy, they're imported when star imported
+    "EditDict",
+    "EditList",
+    "path",
+    "decode",
+)
+
+_SUBMODULES = (
+    "decode",
+    "discover",
+    "editstrucs",
+    "export",
+    "geomap",
+    "history",
+    "level_data",
+    "path",
+    "playdata",
+    "stats",
+    "table",
+)
+
+_ATTRIBUTES = { # Names that used to be imported into pycory with `from .editstrucs import *`
+    "EditDict": "editstrucs",
+    "EditList": "editstrucs",
+}
+
+def _import(name):
+    # __import__ over importlib as importlib isn't always loaded yet and would slow down import
+    __import__(f"{__name__}.{name}")
+    return _sys.modules[f"{__name__}.{name}"]
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return _import(name)
+    if name in _ATTRIBUTES:
+        value = getattr(_import(_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | set(_ATTRIBUTES))
@@ -1,12 +1,17 @@
 import base64
 import zlib
 
+from collections import Counter
+
+_numpy = False # NumPy is only imported by the functions that use it, False is not looked for yet
+
 __all__ = (
     "GEO_SIZE",
     "PAINT_SIZE",
     "decode",
     "geo",
     "paint",
+    "paint_histogram",
     "Geo",
     "Paint"
 )
@@ -90,11 +95,36 @@ def geo(data: str) -> Geo:
     for y in range(GEO_SIZE[1]):
         data_list.append([])
         for x in range(GEO_SIZE[0]):
-            x *= 2 # There are 2 for each x value
-            x + y*GEO_SIZE[0] # Offset x by how many y we are down
-            data_list[-1].append( [ data[x], data[x+1] ] )
+            i = x*2 + y*GEO_SIZE[0]*2 # There are 2 for each x value, offset by how many y we are down
+            data_list[-1].append( [ data[i], data[i+1] ] )
     return Geo(data_list)
 
 def paint(data: str, palette: dict=None) -> Paint:
     pass
 
+
+def _get_numpy():
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+def paint_histogram(data: str) -> list:
+    """
+    Returns how many times each palette index (0 - 15) is in encoded paint data.
+    Each byte of paint holds two indexes, one in each 4 bits.
+    Uses NumPy if installed.
+    """
+    raw = zlib.decompress(base64.b64decode(data))
+    numpy = _get_numpy()
+    if numpy is not None:
+        raw = numpy.frombuffer(raw, dtype=numpy.uint8)
+        return (numpy.bincount(raw >> 4, minlength=16) + numpy.bincount(raw & 15, minlength=16)).tolist()
+    histogram = [0] * 16
+    for byte, count in Counter(raw).items():
+        histogram[byte >> 4] += count
+        histogram[byte & 15] += count
+    return histogram
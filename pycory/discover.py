@@ -0,0 +1,230 @@
+"""
+Discover module for finding Chicory's save and level_data in every Steam library
+
+Found locations are cached in memory and in a cache file,
+so only the first use has to look through Steam libraries.
+"""
+
+import os
+import re
+import sys
+import json
+import tempfile
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+__all__ = (
+    "APP_ID",
+    "GAME_DIR",
+    "parse_vdf",
+    "steam_roots",
+    "steam_libraries",
+    "save_candidates",
+    "level_data_candidates",
+    "cache_location",
+    "find_save_location",
+    "find_level_data_location",
+    "prefetch",
+    "clear_cache",
+)
+
+APP_ID = "1123450"
+
+GAME_DIR = "Chicory A Colorful Tale"
+
+_VDF_TOKEN = re.compile(r'"((?:\\.|[^"\\])*)"|([{}])')
+
+_cache = {} # {"save"/"level_data": Path}
+_lock = threading.Lock()
+
+def parse_vdf(text: str) -> dict:
+    """
+    Returns a dict of Valve's KeyValues text format (e.g libraryfolders.vdf)
+    """
+    root = {}
+    stack = [root]
+    key = None
+    for match in _VDF_TOKEN.finditer(text):
+        string, brace = match.groups()
+        if brace == "{":
+            value = {}
+            stack[-1][key] = value
+            stack.append(value)
+            key = None
+        elif brace == "}":
+            if len(stack) > 1:
+                stack.pop()
+            key = None
+        else:
+            string = re.sub(r"\\(.)", r"\1", string)
+            if key is None:
+                key = string
+            else:
+                stack[-1][key] = string
+                key = None
+    return root
+
+def steam_roots() -> list:
+    """
+    Returns the places Steam is usually installed for this platform (these might not exist)
+    """
+    if sys.platform == "win32" or sys.platform == "cygwin":
+        return [Path(os.path.expandvars("%ProgramFiles(x86)%/Steam")), Path("/Program Files (x86)/Steam"), Path("/Program Files/Steam")]
+    elif sys.platform == "darwin":
+        return [Path("~/Library/Application Support/Steam").expanduser()]
+    return [Path(i).expanduser() for i in (
+        "~/.local/share/Steam",
+        "~/.steam/steam",
+        "~/.steam/root",
+        "~/.var/app/com.valvesoftware.Steam/.local/share/Steam", # Flatpak
+        "~/snap/steam/common/.local/share/Steam",
+    )]
+
+def _library_file_paths(root: Path) -> list:
+    paths = []
+    for vdf in (root / "steamapps" / "libraryfolders.vdf", root / "config" / "libraryfolders.vdf"):
+        try:
+            with vdf.open("r", encoding="utf-8") as f:
+                folders = parse_vdf(f.read())
+        except OSError:
+            continue
+        folders = folders.get("libraryfolders", folders.get("LibraryFolders", {}))
+        for key, value in folders.items():
+            if isinstance(value, dict) and "path" in value:
+                paths.append(Path(value["path"]))
+            elif isinstance(value, str) and key.isdigit(): # Old format is just "1" "path"
+                paths.append(Path(value))
+    return paths
+
+def steam_libraries() -> list:
+    """
+    Returns every Steam library folder, from Steam install locations and their libraryfolders.vdf
+    """
+    roots = steam_roots()
+    with ThreadPoolExecutor(max_workers=len(roots)) as pool:
+        found = pool.map(_library_file_paths, roots)
+        libraries = []
+        seen = set()
+        for library in roots + [i for paths in found for i in paths]:
+            real = os.path.realpath(library)
+            if real not in seen:
+                seen.add(real)
+                libraries.append(library)
+    return libraries
+
+def save_candidates(libraries: list=None) -> list:
+    """
+    Returns every place a save could be, in order of which to use first
+    """
+    if sys.platform == "win32" or sys.platform == "cygwin":
+        return [Path(os.path.expandvars("%LOCALAPPDATA%/paintdog/save/"))]
+    elif sys.platform == "darwin":
+        return [Path("~/Library/Application Support/paintdog/save/").expanduser()]
+    if libraries is None:
+        libraries = steam_libraries()
+    candidates = []
+    for library in libraries:
+        user = library / "steamapps" / "compatdata" / APP_ID / "pfx" / "drive_c" / "users" / "steamuser"
+        candidates.append(user / "Local Settings" / "Application Data" / "paintdog" / "save")
+        candidates.append(user / "AppData" / "Local" / "paintdog" / "save")
+    return candidates
+
+def level_data_candidates(libraries: list=None) -> list:
+    """
+    Returns every place level_data could be, in order of which to use first
+    """
+    if libraries is None:
+        libraries = steam_libraries()
+    return [library / "steamapps" / "common" / GAME_DIR / "PC" / "level_data" for library in libraries]
+
+def cache_location() -> Path:
+    """
+    Location of the cache file, in the user's cache directory
+    """
+    if sys.platform == "win32" or sys.platform == "cygwin":
+        base = Path(os.path.expandvars("%LOCALAPPDATA%"))
+    elif sys.platform == "darwin":
+        base = Path("~/Library/Caches").expanduser()
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser()
+    return base / "pycory" / "locations.json"
+
+def _read_cache() -> dict:
+    try:
+        with cache_location().open("r") as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def _write_cache(kind: str, location: Path):
+    cache = _read_cache()
+    cache[kind] = str(location)
+    try:
+        cache_location().parent.mkdir(parents=True, exist_ok=True)
+        # Written to a temporary file then replaced so other processes never read a half written cache
+        with tempfile.NamedTemporaryFile("w", dir=cache_location().parent, prefix=".locations", suffix=".tmp", delete=False) as f:
+            f.write(json.dumps(cache))
+        try:
+            os.replace(f.name, cache_location())
+        except OSError:
+            os.unlink(f.name)
+            raise
+    except OSError:
+        pass # Not being able to cache shouldn't stop finding
+
+def _find(kind: str, candidates, check, refresh: bool):
+    if not refresh and kind in _cache:
+        return _cache[kind]
+    with _lock:
+        if not refresh and kind in _cache: # Found while waiting (e.g by prefetch)
+            return _cache[kind]
+        cached = None if refresh else _read_cache().get(kind)
+        if cached and check(Path(cached)): # Checking the cached location is one stat
+            _cache[kind] = Path(cached)
+            return _cache[kind]
+        candidates = candidates()
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(candidates)))) as pool:
+            exists = list(pool.map(check, candidates))
+        for location, found in zip(candidates, exists):
+            if found:
+                _cache[kind] = location
+                _write_cache(kind, location)
+                return location
+        _cache.pop(kind, None)
+        return None
+
+def find_save_location(refresh: bool=False) -> Path:
+    """
+    Returns the first save directory found or None
+    After the first call this is returned from memory unless refresh is True
+    """
+    return _find("save", save_candidates, Path.is_dir, refresh)
+
+def find_level_data_location(refresh: bool=False) -> Path:
+    """
+    Returns the first level_data file found or None
+    After the first call this is returned from memory unless refresh is True
+    """
+    return _find("level_data", level_data_candidates, Path.is_file, refresh)
+
+def prefetch() -> threading.Thread:
+    """
+    Starts finding the save and level_data in the background,
+    find_save_location and find_level_data_location wait for it if it hasn't finished
+    """
+    def run():
+        find_save_location()
+        find_level_data_location()
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+def clear_cache():
+    """
+    Forgets found locations, in memory and in the cache file
+    """
+    with _lock:
+        _cache.clear()
+        cache_location().unlink(missing_ok=True)
@@ -0,0 +1,167 @@
+"""
+Export module for turning level_data into column tables
+
+NumPy and PyArrow are optional, without NumPy columns are plain lists
+and without PyArrow the to_arrow/write functions can't be used.
+PyArrow is only imported when it's used.
+"""
+
+import json
+
+from pathlib import Path
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .level_data import LevelDataScreen
+
+__all__ = (
+    "SCREEN_FIELDS",
+    "LevelDataColumns",
+    "split_screen_key",
+    "level_data_columns",
+)
+
+SCREEN_FIELDS = ("area", "palette", "music", "ambiance", "transition", "title", "name", "geo", "exits")
+
+def split_screen_key(key: str) -> tuple:
+    """
+    Splits a level_data screen key into ints.
+    "0_1_2" -> (0, 1, 2) formatted (layer, x, y)
+    """
+    layer, x, y = key.split("_")
+    return int(layer), int(x), int(y)
+
+class _Table():
+    """
+    Builds columns a row at a time, columns missing from a row get padded with None
+    Only the columns in a row are touched, the rest are padded when they're next used or in finish()
+    """
+    def __init__(self, columns=()):
+        self.columns = {column: [] for column in columns}
+        self.length = 0
+
+    def append(self, row: dict):
+        for column, value in row.items():
+            values = self.columns.setdefault(column, [])
+            if len(values) != self.length:
+                values.extend([None] * (self.length - len(values)))
+            values.append(value)
+        self.length += 1
+
+    def finish(self) -> dict:
+        for values in self.columns.values():
+            values.extend([None] * (self.length - len(values)))
+        return {column: _to_array(values) for column, values in self.columns.items()}
+
+def _flat(value):
+    # Nested lists/dicts get stored as json so every column is a scalar type
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+def _to_array(values: list):
+    kinds = {type(i) for i in values} - {type(None)}
+    if len(kinds) > 1 and not kinds <= {int, float}:
+        # Mixed types (e.g obj_ keys that mean different things on different objects) are stored as strings so Arrow can use them
+        values = [i if i is None or isinstance(i, str) else json.dumps(i) for i in values]
+        kinds = {str}
+    if numpy is None:
+        return values
+    missing = any(i is None for i in values)
+    if kinds == {int} and not missing:
+        return numpy.array(values, dtype=numpy.int64)
+    if kinds == {bool} and not missing:
+        return numpy.array(values, dtype=bool)
+    if kinds and kinds <= {int, float}:
+        # Missing numbers are NaN so columns with gaps (most obj_/deco_ keys) stay numeric
+        return numpy.array([numpy.nan if i is None else i for i in values], dtype=numpy.float64)
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+class LevelDataColumns():
+    """
+    Column tables of level_data, each table is a dict of {column: array}
+
+    screens: one row per screen, with layer/x/y split out of the key and SCREEN_FIELDS
+    objects: one row per object, with screen, layer, x, y, index then every object key (prefixed with "obj_")
+    decos: same as objects but for decos (prefixed with "deco_")
+
+    Arrays are NumPy arrays if NumPy is installed, otherwise lists.
+    With NumPy, number columns with missing values are float64 with NaN for missing (null in Arrow).
+    """
+    def __init__(self, screens: dict, objects: dict, decos: dict):
+        self.screens = screens
+        self.objects = objects
+        self.decos = decos
+
+    def tables(self) -> dict:
+        return {"screens": self.screens, "objects": self.objects, "decos": self.decos}
+
+    def to_arrow(self) -> dict:
+        """
+        Returns a dict of {"screens"/"objects"/"decos": pyarrow.Table}
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("pyarrow is required for arrow export.")
+        return {name: pyarrow.table({column: pyarrow.array(values, from_pandas=True) for column, values in table.items()})
+                for name, table in self.tables().items()}
+
+    def _write(self, directory, suffix, writer):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = {}
+        for name, table in self.to_arrow().items():
+            paths[name] = directory / (name + suffix)
+            writer(table, paths[name])
+        return paths
+
+    def write_parquet(self, directory) -> dict:
+        """
+        Writes screens.parquet, objects.parquet and decos.parquet to directory
+        Returns a dict of the paths written
+        """
+        from pyarrow import parquet
+        return self._write(directory, ".parquet", parquet.write_table)
+
+    def write_feather(self, directory) -> dict:
+        """
+        Writes screens.feather, objects.feather and decos.feather to directory
+        Returns a dict of the paths written
+        """
+        from pyarrow import feather
+        return self._write(directory, ".feather", feather.write_feather)
+
+def level_data_columns(level_data: dict) -> LevelDataColumns:
+    """
+    Builds LevelDataColumns from level_data in one pass.
+    level_data can be a LevelDataRead or the plain dict from the level_data json.
+    """
+    screens = _Table(("screen", "layer", "x", "y") + SCREEN_FIELDS)
+    objects = _Table(("screen", "layer", "x", "y", "index"))
+    decos = _Table(("screen", "layer", "x", "y", "index"))
+
+    for key, content in dict.items(level_data): # dict.items so LevelDataRead doesn't wrap every screen
+        if isinstance(content, LevelDataScreen):
+            content = content.to_dict()
+        layer, x, y = split_screen_key(key)
+        location = {"screen": key, "layer": layer, "x": x, "y": y}
+
+        row = dict(location)
+        for field in SCREEN_FIELDS:
+            row[field] = _flat(content.get(field, None))
+        screens.append(row)
+
+        for table, items, prefix in ((objects, content.get("objects", []), "obj_"), (decos, content.get("decos", []), "deco_")):
+            for index, item in enumerate(items):
+                row = dict(location, index=index)
+                for item_key, value in item.items():
+                    row[prefix + item_key] = _flat(value)
+                table.append(row)
+
+    return LevelDataColumns(screens.finish(), objects.finish(), decos.finish())
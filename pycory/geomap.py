@@ -0,0 +1,135 @@
+"""
+Geomap module for walkability and connected regions of geo
+"""
+
+from functools import lru_cache
+
+from .decode import GEO_SIZE, geo
+
+__all__ = (
+    "is_ground",
+    "GeoMap",
+    "geo_map",
+    "GeoWorld",
+)
+
+def is_ground(value: list) -> bool:
+    """
+    Default walkable check, a cell is walkable if its geo value is ["0", "0"] (ground level)
+    """
+    return value[0] == "0" and value[1] == "0"
+
+class GeoMap():
+    """
+    Walkability mask and region labels of a screen's geo, made with geo_map(geo_string)
+    Positions are geo cells, 0 indexed, [0,0] is top left
+
+    mask is a flat bytearray (1 = walkable) and labels a flat list of region numbers (0 = not walkable),
+    both indexed with x + y*GEO_SIZE[0].
+    Walkable cells are in the same region if they're connected (up, down, left, right) through walkable cells.
+    connected can be a function of two neighbouring geo values that returns whether you can walk between them (e.g for heights),
+    by default any two walkable neighbours are connected.
+    """
+    def __init__(self, values: list, walkable=is_ground, connected=None):
+        width, height = GEO_SIZE
+        self.values = values
+        self.mask = bytearray(int(bool(walkable(value))) for value in values)
+        self.labels = [0] * (width*height)
+        self.regions = 0
+
+        for start in range(width*height):
+            if not self.mask[start] or self.labels[start]:
+                continue
+            self.regions += 1
+            self.labels[start] = self.regions
+            stack = [start]
+            while stack:
+                i = stack.pop()
+                for n in self._neighbours(i):
+                    if self.mask[n] and not self.labels[n] and (connected is None or connected(self.values[i], self.values[n])):
+                        self.labels[n] = self.regions
+                        stack.append(n)
+
+    def _neighbours(self, i):
+        width, height = GEO_SIZE
+        x, y = i % width, i // width
+        if x > 0:
+            yield i - 1
+        if x < width - 1:
+            yield i + 1
+        if y > 0:
+            yield i - width
+        if y < height - 1:
+            yield i + width
+
+    def _index(self, x, y):
+        if not (0 <= x < GEO_SIZE[0]):
+            raise IndexError(f"x value must be between 0 and {GEO_SIZE[0]-1}")
+        if not (0 <= y < GEO_SIZE[1]):
+            raise IndexError(f"y value must be between 0 and {GEO_SIZE[1]-1}")
+        return x + y*GEO_SIZE[0]
+
+    def walkable(self, x: int, y: int) -> bool:
+        return bool(self.mask[self._index(x, y)])
+
+    def region(self, x: int, y: int) -> int:
+        """
+        Returns the region number of a cell, 0 if it isn't walkable
+        """
+        return self.labels[self._index(x, y)]
+
+    def neighbours(self, x: int, y: int):
+        """
+        Yields the walkable x, y cells next to a cell (up, down, left, right)
+        """
+        for n in self._neighbours(self._index(x, y)):
+            if self.mask[n]:
+                yield n % GEO_SIZE[0], n // GEO_SIZE[0]
+
+    def reachable(self, start: tuple, end: tuple) -> bool:
+        """
+        Returns whether end (x, y) can be walked to from start (x, y)
+        """
+        region = self.region(*start)
+        return bool(region) and region == self.region(*end)
+
+@lru_cache(maxsize=1024)
+def geo_map(data: str, walkable=is_ground, connected=None) -> GeoMap:
+    """
+    Returns a GeoMap of a geo string.
+    Cached by geo string (and walkable and connected checks) so screens with the same geo share one GeoMap, don't edit it.
+    """
+    values = [value for x, y, value in geo(data).enumerate()]
+    return GeoMap(values, walkable, connected)
+
+class GeoWorld():
+    """
+    GeoMaps for every screen of level_data, made the first time a screen is used.
+
+        with pycory.path.find_level_data().open("r") as level_data:
+            world = pycory.geomap.GeoWorld(level_data)
+            world.reachable("0_0_0", (40, 40), (10, 30))
+    """
+    def __init__(self, level_data: dict, walkable=is_ground, connected=None):
+        self.level_data = level_data
+        self.walkable = walkable
+        self.connected = connected
+        self.maps = {}
+
+    def __getitem__(self, screen: str) -> GeoMap:
+        if screen not in self.maps:
+            content = dict.__getitem__(self.level_data, screen) # dict.__getitem__ so LevelDataRead doesn't wrap the screen
+            data = content.geo if hasattr(content, "geo") else content.get("geo", None)
+            if data is None:
+                raise KeyError(f"Screen {screen} has no geo")
+            self.maps[screen] = geo_map(data, self.walkable, self.connected)
+        return self.maps[screen]
+
+    def walkable_at(self, screen: str, x: int, y: int) -> bool:
+        return self[screen].walkable(x, y)
+
+    def reachable(self, screen: str, start: tuple, end: tuple) -> bool:
+        """
+        Returns whether end (x, y) can be walked to from start (x, y) on screen
+        """
+        return self[screen].reachable(start, end)
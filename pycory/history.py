@@ -0,0 +1,232 @@
+"""
+History module for keeping many _playdata snapshots as deltas
+"""
+
+import json
+import hashlib
+
+from pathlib import Path
+
+from .playdata import PlaydataRead, Playdata
+
+__all__ = (
+    "BLOB_SIZE",
+    "CHECKPOINT_EVERY",
+    "PlaydataHistory",
+)
+
+BLOB_SIZE = 256 # Dict string values this long or longer (paint data) are stored once by hash
+
+CHECKPOINT_EVERY = 32 # Every this many snapshots the whole state is saved so getting a snapshot never replays more deltas than this
+
+def _dict_line(line: str):
+    """
+    Returns the dict of a line if it's a dict line that can be written back exactly, otherwise None
+    """
+    if not line.startswith("{"):
+        return None
+    try:
+        value = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(value, dict) or _dump(value) != line:
+        return None
+    return value
+
+def _dump(value: dict) -> str:
+    return json.dumps(value, separators=(",", ":")) + " \n"
+
+class PlaydataHistory():
+    """
+    Stores _playdata snapshots in a directory, the first is stored in full and every one after only as what changed.
+    Lines that changed are stored, and for dict lines only the keys that changed.
+    Long strings (paint data) are stored once in blobs/ no matter how many snapshots have them.
+
+        history = pycory.history.PlaydataHistory(Path("history"))
+        history.add(save.playdata)
+        playdata = history.open(0)
+        print(playdata.screen)
+
+    Every CHECKPOINT_EVERY snapshots the whole state is saved in checkpoints/ (with paint as blob hashes).
+    Getting a snapshot starts from the checkpoint before it and applies the changes of each snapshot after that,
+    going forward from the last snapshot got is only the changes between them.
+    """
+    def __init__(self, location: Path):
+        self.location = Path(location)
+        (self.location / "deltas").mkdir(parents=True, exist_ok=True)
+        (self.location / "checkpoints").mkdir(exist_ok=True)
+        (self.location / "blobs").mkdir(exist_ok=True)
+        self._blobs = {}
+        self._state = None # [number, lines, {line: dict}, set of lines to dump]
+        try:
+            with (self.location / "count").open("r") as f:
+                self._count = int(f.read())
+        except (OSError, ValueError):
+            self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _delta_path(self, number: int) -> Path:
+        return self.location / "deltas" / f"{number:08}.json"
+
+    def _checkpoint_path(self, number: int) -> Path:
+        return self.location / "checkpoints" / f"{number:08}.json"
+
+    def _blob(self, digest: str) -> str:
+        if digest not in self._blobs:
+            with (self.location / "blobs" / digest).open("r") as f:
+                self._blobs[digest] = f.read()
+        return self._blobs[digest]
+
+    def _store_blob(self, value: str) -> str:
+        digest = hashlib.sha1(value.encode()).hexdigest()
+        if digest not in self._blobs:
+            path = self.location / "blobs" / digest
+            if not path.is_file():
+                with path.open("w") as f:
+                    f.write(value)
+            self._blobs[digest] = value
+        return digest
+
+    def _value(self, value):
+        if isinstance(value, str) and len(value) >= BLOB_SIZE:
+            return ["b", self._store_blob(value)]
+        return ["v", value]
+
+    def _load_value(self, change):
+        if change[0] == "b":
+            return self._blob(change[1])
+        return change[1]
+
+    def _write_checkpoint(self):
+        number, lines, dicts, dirty = self._state
+        checkpoint = {
+            "lines": ["" if i in dicts else line for i, line in enumerate(lines)],
+            "dicts": {i: {key: self._value(value) for key, value in values.items()} for i, values in dicts.items()},
+        }
+        with self._checkpoint_path(number).open("w") as f:
+            f.write(json.dumps(checkpoint, separators=(",", ":")))
+
+    def _load_checkpoint(self, number: int):
+        with self._checkpoint_path(number).open("r") as f:
+            checkpoint = json.loads(f.read())
+        dicts = {int(i): {key: self._load_value(change) for key, change in values.items()} for i, values in checkpoint["dicts"].items()}
+        self._state = [number, checkpoint["lines"], dicts, set(dicts)]
+
+    def _apply(self, delta: dict):
+        number, lines, dicts, dirty = self._state
+        del lines[delta["length"]:]
+        lines.extend([""] * (delta["length"] - len(lines)))
+        for line in list(dicts):
+            if line >= delta["length"]:
+                del dicts[line]
+                dirty.discard(line)
+        for line, (kind, value) in delta["lines"].items():
+            line = int(line)
+            if kind == "s":
+                lines[line] = value
+                dicts.pop(line, None)
+                dirty.discard(line)
+            else:
+                if line not in dicts:
+                    dicts[line] = _dict_line(lines[line]) or {}
+                for key, change in value.items():
+                    if change[0] == "x":
+                        dicts[line].pop(key, None)
+                    else:
+                        dicts[line][key] = self._load_value(change)
+                dirty.add(line)
+        self._state[0] += 1
+
+    def _walk(self, number: int):
+        """
+        Moves self._state to snapshot number, reading at most CHECKPOINT_EVERY files
+        """
+        if not (0 <= number < self._count):
+            raise IndexError(f"No snapshot {number}")
+        checkpoint = number - number % CHECKPOINT_EVERY
+        if self._state is None or not (checkpoint <= self._state[0] <= number):
+            self._load_checkpoint(checkpoint)
+        for i in range(self._state[0] + 1, number + 1):
+            with self._delta_path(i).open("r") as f:
+                self._apply(json.loads(f.read()))
+
+    def lines(self, number: int=-1) -> list:
+        """
+        Returns the lines of a snapshot, same as _playdata's readlines()
+        number can be negative to count from the latest snapshot
+        """
+        if number < 0:
+            number += len(self)
+        self._walk(number)
+        number, lines, dicts, dirty = self._state
+        for line in dirty:
+            lines[line] = _dump(dicts[line])
+        dirty.clear()
+        return list(lines)
+
+    def add(self, content) -> int:
+        """
+        Adds a snapshot, content can be a Playdata, PlaydataRead or list of lines
+        Returns the number of the snapshot
+        """
+        if isinstance(content, Playdata):
+            with content.location.open("r") as f:
+                content = f.readlines()
+        elif isinstance(content, PlaydataRead):
+            content = [_dump(i) if isinstance(i, dict) else i for i in content.content]
+
+        number = self._count
+        if number:
+            self._walk(number - 1)
+            state, lines, dicts, dirty = self._state
+        else:
+            self._state = [-1, [], {}, set()]
+            lines, dicts, dirty = self._state[1:]
+
+        delta = {"length": len(content), "lines": {}}
+        for i, line in enumerate(content):
+            if i < len(lines) and i not in dicts and lines[i] == line:
+                continue
+            new = _dict_line(line)
+            if new is None:
+                delta["lines"][i] = ["s", line]
+                continue
+            old = dicts.get(i)
+            if old is None:
+                old = _dict_line(lines[i]) if i < len(lines) else None
+            if old == new:
+                continue
+            if old is None: # New dict line, even {} has to be stored
+                old = {}
+            changes = {key: self._value(value) for key, value in new.items() if key not in old or old[key] != value}
+            changes.update({key: ["x"] for key in old if key not in new})
+            if _dump({**{key: value for key, value in old.items() if key in new}, **new}) != line:
+                delta["lines"][i] = ["s", line] # Key order changed, can't be rebuilt from key changes
+            else:
+                delta["lines"][i] = ["d", changes]
+
+        with self._delta_path(number).open("w") as f:
+            f.write(json.dumps(delta, separators=(",", ":")))
+        self._count += 1
+        self._apply(delta) # State is now this snapshot, so the next add doesn't read anything
+        if number % CHECKPOINT_EVERY == 0:
+            self._write_checkpoint()
+        with (self.location / "count").open("w") as f:
+            f.write(str(self._count))
+        return number
+
+    def write(self, number: int, location: Path):
+        """
+        Writes a snapshot to a file, e.g to restore a save's _playdata
+        """
+        content = self.lines(number)
+        with Path(location).open("w") as f:
+            f.writelines(content)
+
+    def open(self, number: int=-1) -> PlaydataRead:
+        """
+        Returns a read only PlaydataRead of a snapshot
+        """
+        return PlaydataRead(self.lines(number), False)
@@ -40,7 +40,7 @@ def find_save(location=None) -> Save:
     Returns a save location from first:
       - Location argument
       - `CHICORYSAVEPATH` Environment variable
-      - Default save location
+      - Default save location (searched for in every Steam library)
     """
     if not location:
         if "CHICORYSAVEPATH" in os.environ:
@@ -48,13 +48,11 @@ def find_save(location=None) -> Save:
             location = os.environ["CHICORYSAVEPATH"]
 
     if not location:
-        if sys.platform == "win32" or sys.platform ==  "cygwin":
-            save = Path(os.path.expandvars("%LOCALAPPDATA%/paintdog/save/"))
-        elif sys.platform == "darwin":
-            save = Path("~/Library/Application Support/paintdog/save/").expanduser()
-        elif sys.platform == "linux":
-            save = Path("~/.local/share/Steam/steamapps/compatdata/1123450/pfx/drive_c/users/steamuser/Local Settings/Application Data/paintdog/save/").expanduser()
-        isfrom = "Default"
+        from .discover import find_save_location # Only imported here as it's slow to import and not needed for given locations
+        save = find_save_location() # Checks every Steam library, cached after the first time
+        if save is None:
+            raise FileNotFoundError("Couldn't find save file. (from Default)")
+        return Save(save)
     else:
         if sys.platform == "win32" or sys.platform == "cygwin":
             save = Path(os.path.expandvars(str(location)))
@@ -73,7 +71,7 @@ def find_level_data(location=None) -> LevelData:
     Returns a save location from first:
       - Location argument
       - `CHICORYLEVELDATAPATH` Environment variable
-      - Default level_data location
+      - Default level_data location (searched for in every Steam library)
     """
     if not location:
         if "CHICORYLEVELDATAPATH" in os.environ:
@@ -81,13 +79,11 @@ def find_level_data(location=None) -> LevelData:
             location = os.environ["CHICORYLEVELDATAPATH"]
 
     if not location:
-        if sys.platform == "win32" or sys.platform ==  "cygwin":
-            level_data = Path("/Program Files (x86)/Steam/steamapps/common/Chicory A Colorful Tale/PC/level_data")
-        elif sys.platform == "darwin":
-            level_data = Path("~/Library/Application Support/Steam/steamapps/common/Chicory A Colorful Tale/PC/level_data").expanduser()
-        elif sys.platform == "linux":
-            level_data = Path("~/.local/share/Steam/steamapps/common/Chicory A Colorful Tale/PC/level_data").expanduser()
-        isfrom = "Default"
+        from .discover import find_level_data_location
+        level_data = find_level_data_location()
+        if level_data is None:
+            raise FileNotFoundError("Couldn't find level_data file. (from Default)")
+        return LevelData(level_data)
     else:
         if sys.platform == "win32" or sys.platform == "cygwin":
             level_data = Path(os.path.expandvars(str(location)))
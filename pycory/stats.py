@@ -0,0 +1,108 @@
+"""
+Stats module for paint coverage of a save
+"""
+
+import json
+import hashlib
+
+from pathlib import Path
+
+from .decode import paint_histogram
+
+__all__ = (
+    "PaintStats",
+)
+
+def _digest(data: str) -> str:
+    return hashlib.sha1(data.encode()).hexdigest()
+
+class PaintStats():
+    """
+    Counts of each palette index (0 - 15) for each screen's paint, index 0 is unpainted.
+    Screens are only decoded again when their paint string has changed since the last update.
+    Use with the paint dict of a save, for example:
+
+        stats = pycory.stats.PaintStats()
+        with save.playdata.open("r") as playdata:
+            stats.update(playdata.paint)
+        print(stats.world_coverage())
+
+    Screen keys are the paint keys without ".paint", e.g "0_1_2"
+    """
+    def __init__(self):
+        self.screens = {} # {screen: [digest, histogram]}
+        self._world = None
+
+    def update(self, paint: dict) -> list:
+        """
+        Updates stats from a paint dict ({"layer_x_y.paint": "paintdata"}),
+        screens not in paint are removed.
+        Returns a list of the screens that were recomputed.
+        """
+        changed = []
+        seen = set()
+        for key, data in dict.items(paint): # dict.items so EditDict doesn't wrap anything
+            screen = key[:-len(".paint")] if key.endswith(".paint") else key
+            seen.add(screen)
+            digest = _digest(data)
+            cached = self.screens.get(screen)
+            if cached is None or cached[0] != digest:
+                self.screens[screen] = [digest, paint_histogram(data)]
+                changed.append(screen)
+        for screen in set(self.screens) - seen:
+            del self.screens[screen]
+            changed.append(screen)
+        if changed:
+            self._world = None
+        return changed
+
+    def histogram(self, screen: str) -> list:
+        """
+        Returns the index counts of a screen as a list of 16 ints.
+        """
+        return self.screens[screen][1]
+
+    def coverage(self, screen: str) -> float:
+        """
+        Returns the fraction of a screen that is painted (not index 0).
+        """
+        return _coverage(self.histogram(screen))
+
+    def world_histogram(self) -> list:
+        """
+        Returns the index counts of every screen added together.
+        """
+        if self._world is None:
+            self._world = [sum(counts) for counts in zip(*(i[1] for i in self.screens.values()))] or [0] * 16
+        return self._world
+
+    def world_coverage(self) -> float:
+        """
+        Returns the fraction of every screen that is painted (not index 0).
+        """
+        return _coverage(self.world_histogram())
+
+    def save(self, location: Path):
+        """
+        Saves the stats to a json file so they can be loaded on another run with PaintStats.load
+        """
+        with Path(location).open("w") as f:
+            f.write(json.dumps(self.screens, separators=(",", ":")))
+
+    @classmethod
+    def load(cls, location: Path) -> "PaintStats":
+        """
+        Loads stats saved with PaintStats.save, returns empty stats if the file doesn't exist.
+        """
+        stats = cls()
+        location = Path(location)
+        if location.is_file():
+            with location.open("r") as f:
+                stats.screens = json.loads(f.read())
+        return stats
+
+def _coverage(histogram: list) -> float:
+    total = sum(histogram)
+    if not total:
+        return 0.0
+    return (total - histogram[0]) / total
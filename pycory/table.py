@@ -0,0 +1,179 @@
+"""
+Table module for column views of playdata dicts like decor and character_states
+"""
+
+from bisect import bisect_left, bisect_right
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+__all__ = (
+    "RecordTable",
+    "decor_table",
+    "character_states_table",
+)
+
+class RecordTable():
+    """
+    Columns of a dict of records, e.g decor { "DECOR NAME": { "x": XPOS, "y": YPOS, "lvl": "SCREEN_X_Y", "flip": 0/1, "time": TIMEINT } }
+    Records that aren't dicts are kept in the "value" column.
+
+    If index is a field name (e.g "lvl") rows are indexed by it for where().
+    Changes made with set() are only written to the original dict with write_back(), and only for records that changed.
+
+        table = pycory.table.decor_table(playdata)
+        for name in table.where("0_1_2", sort="time"):
+            print(name, table.get(name, "x"), table.get(name, "y"))
+    """
+    def __init__(self, records: dict, index: str=None):
+        self.records = records
+        self.names = []
+        self.rows = {} # {name: row}
+        self.columns = {} # {field: [value for each row]}
+        self._fields = [] # Fields each record has, in order, None is used in columns for missing fields
+        self._plain = set() # Rows that aren't dicts
+        self._changed = set()
+        self._sorted = {} # {field: ([sorted values], [rows])} made when first used
+        self.index_field = index
+        self.index = {}
+
+        for name, record in dict.items(records): # dict.items so EditDict doesn't wrap every record
+            row = len(self.names)
+            self.names.append(name)
+            self.rows[name] = row
+            if not isinstance(record, dict):
+                self._plain.add(row)
+                record = {"value": record}
+            self._fields.append(list(record))
+            for field, value in record.items():
+                if field not in self.columns:
+                    self.columns[field] = [None] * row
+                self.columns[field].append(value)
+            for values in self.columns.values():
+                if len(values) != row + 1:
+                    values.append(None)
+
+        if index is not None:
+            for row, key in enumerate(self.columns.get(index, [None] * len(self.names))):
+                self.index.setdefault(key, []).append(row)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.rows
+
+    def get(self, name: str, field: str):
+        return self.columns[field][self.rows[name]]
+
+    def set(self, name: str, field: str, value):
+        """
+        Sets field of a record, use write_back() to write changes to the original dict
+        """
+        row = self.rows[name]
+        if row in self._plain and field != "value":
+            raise TypeError(f"Record {name} isn't a dict, only \"value\" can be set")
+        if field in self.columns and field in self._fields[row] and self.columns[field][row] == value:
+            return
+        if field not in self.columns:
+            self.columns[field] = [None] * len(self.names)
+        old = self.columns[field][row]
+        self.columns[field][row] = value
+        if field not in self._fields[row]:
+            self._fields[row].append(field)
+        self._changed.add(row)
+        self._sorted.pop(field, None)
+        if field == self.index_field and old != value:
+            self.index[old].remove(row)
+            self.index.setdefault(value, []).append(row)
+
+    def record(self, name: str):
+        """
+        Returns a record as it would be in the original dict
+        """
+        row = self.rows[name]
+        if row in self._plain:
+            return self.columns["value"][row]
+        return {field: self.columns[field][row] for field in self._fields[row]}
+
+    def array(self, field: str):
+        """
+        Returns a column as a NumPy array, or a list if NumPy isn't installed
+        """
+        if numpy is None:
+            return list(self.columns[field])
+        return numpy.array(self.columns[field])
+
+    def _names(self, rows, sort):
+        if sort is not None:
+            values = self.columns[sort]
+            rows = sorted(rows, key=lambda row: (values[row] is None, values[row]))
+        return [self.names[row] for row in rows]
+
+    def where(self, key, sort: str=None) -> list:
+        """
+        Returns names of records with the index field equal to key, e.g decor on a screen
+        sort is a field to sort them by
+        """
+        if self.index_field is None:
+            raise ValueError("RecordTable has no index field")
+        return self._names(self.index.get(key, []), sort)
+
+    def range(self, field: str, low=None, high=None, names: list=None) -> list:
+        """
+        Returns names of records where low <= field <= high, sorted by field
+        low or high can be None to not limit that side
+        If names is given only those records are checked, e.g range("time", 0, 100, table.where("0_1_2"))
+        """
+        values = self.columns.get(field, [])
+        if names is not None:
+            rows = [self.rows[name] for name in names]
+            rows = [row for row in rows if values[row] is not None
+                    and (low is None or values[row] >= low) and (high is None or values[row] <= high)]
+            return self._names(rows, field)
+        if field not in self._sorted:
+            rows = sorted((row for row, value in enumerate(values) if value is not None), key=values.__getitem__)
+            self._sorted[field] = ([values[row] for row in rows], rows)
+        sorted_values, rows = self._sorted[field]
+        start = 0 if low is None else bisect_left(sorted_values, low)
+        end = len(rows) if high is None else bisect_right(sorted_values, high)
+        return [self.names[row] for row in rows[start:end]]
+
+    def within(self, x: tuple, y: tuple, names: list=None) -> list:
+        """
+        Returns names of records with low <= x <= high and low <= y <= high
+        x and y are (low, high)
+        """
+        in_y = set(self.range("y", *y, names=names))
+        return [name for name in self.range("x", *x, names=names) if name in in_y]
+
+    @property
+    def changed(self) -> list:
+        return [self.names[row] for row in sorted(self._changed)]
+
+    def write_back(self, records: dict=None) -> list:
+        """
+        Writes changed records to records (default is the dict the table was made from)
+        Returns the names written
+        """
+        if records is None:
+            records = self.records
+        written = self.changed
+        for name in written:
+            records[name] = self.record(name)
+        self._changed.clear()
+        return written
+
+def decor_table(playdata) -> RecordTable:
+    """
+    Returns a RecordTable of a PlaydataRead's decor, indexed by "lvl"
+    """
+    return RecordTable(playdata.decor, index="lvl")
+
+def character_states_table(playdata) -> RecordTable:
+    """
+    Returns a RecordTable of a PlaydataRead's character_states
+    """
+    return RecordTable(playdata.character_states)
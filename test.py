@@ -6,14 +6,27 @@ Runs tests specified in arguments or all if no arguments.
 Tests:
 - playdata
 - level_data
+- geo
+- geomap
+- export
+- import
+- stats
+- history
+- discover
+- table
 
 Usage example:
 `python3 test.py playdata level_data`
 """
 
+import os
 import sys
 import random
 import inspect
+import tempfile
+import subprocess
+
+from pathlib import Path
 
 import pycory
 
@@ -62,10 +75,212 @@ def test_geo():
             print(f"{' - ' if x!=0 and y!=0 else ''}{x},{y} = {''.join(value)}", end="")
     print("")
 
+def test_geomap():
+    print("\n== geomap Test ==\n")
+    geo_string = "eJztz8EOhCAMRdEXx/7/LzsBokSKfU0xM4vejYG0h7jvY1vtM69NKLtqCb4CjscYqJ4D4OyC44C1IBwgloOECB9oi17QFN2gJf49WEZAgqBBUCAIEOhEAwQBAr34DMIJwgC7Sc77iue6SLkQucB6Fhd4Jbdv45s3B2ee/sjpLQK7LFDkcZ0Hx38Jik7FFAOeKoY8hYx6lVygZFmW/aoDrtoX0Q=="
+    geo_map = pycory.geomap.geo_map(geo_string)
+    print(f"Regions: {geo_map.regions}")
+    print(f"40,40 walkable: {geo_map.walkable(40,40)}, 0,0 walkable: {geo_map.walkable(0,0)}")
+    print(f"40,40 -> 5,40 reachable: {geo_map.reachable((40,40),(5,40))}")
+    assert pycory.geomap.geo_map(geo_string) is geo_map
+    assert not geo_map.reachable((0,0),(40,40))
+
+    everywhere = pycory.geomap.geo_map(geo_string, lambda value: True)
+    assert everywhere.regions == 1 and everywhere.reachable((0,0),(40,40))
+    same_height = pycory.geomap.geo_map(geo_string, lambda value: True, lambda a, b: a == b)
+    assert same_height.regions > 1 and not same_height.reachable((0,0),(40,40))
+
+def test_export():
+    print("\n== export Test ==\n")
+
+    level = pycory.path.find_level_data()
+
+    with level.open("r") as level_data:
+        columns = pycory.export.level_data_columns(level_data)
+    print(f"Screens: {len(columns.screens['screen'])}, Objects: {len(columns.objects['screen'])}, Decos: {len(columns.decos['screen'])}")
+    areas = {}
+    for area in columns.screens["area"]:
+        areas[area] = areas.get(area, 0) + 1
+    print(f"Screens per area: {areas}")
+
+def test_import():
+    print("\n== import Test ==\n")
+
+    # Run in a new interpreter so submodules imported by other tests don't count
+    code = inspect.cleandoc(
+        """
+        import sys, time
+        start = time.perf_counter()
+        import pycory
+        took = time.perf_counter() - start
+        print(took, *sorted(i for i in sys.modules if i.startswith("pycory.")))
+        """
+    )
+    took, *loaded = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                   cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+    print(f"import pycory took {float(took)*1000:.2f}ms")
+    assert not loaded, f"import pycory loaded submodules: {loaded}"
+    assert float(took) < 0.05, "import pycory is too slow"
+    assert pycory.EditDict is pycory.editstrucs.EditDict
+    assert "sys" not in dir(pycory)
+    star = {}
+    exec("from pycory import *", star)
+    assert {"EditDict", "EditList", "path", "decode"} <= set(star)
+    print("No submodules loaded on import.")
+
+def test_stats():
+    print("\n== stats Test ==\n")
+
+    save = pycory.path.find_save()
+
+    stats = pycory.stats.PaintStats()
+    with save.playdata.open("r") as playdata:
+        print(f"Screens computed: {len(stats.update(playdata.paint))}")
+        print(f"Screens computed again: {len(stats.update(playdata.paint))}")
+    print(f"World painted: {stats.world_coverage()*100:.2f}%")
+    print(f"World histogram: {stats.world_histogram()}")
+
+def test_history():
+    print("\n== history Test ==\n")
+
+    save = pycory.path.find_save()
+
+    with tempfile.TemporaryDirectory() as directory:
+        history = pycory.history.PlaydataHistory(directory)
+        history.add(save.playdata)
+        with save.playdata.open("r") as playdata:
+            first = [i for i in playdata.content]
+            playdata.content[0] = "99 \n" # Not written as it's opened for reading
+            history.add(playdata)
+        assert history.lines(0) == first
+        assert history.open(1).screen[1] == 99
+        print(f"Snapshots: {len(history)}, Second snapshot screen: {history.open(1).screen}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        history = pycory.history.PlaydataHistory(directory)
+        history.add(["1 \n", "{} \n", '{"a":1} \n'])
+        history.add(["1 \n", "{} \n", '{"a":2} \n', "{} \n"])
+        assert history.lines(0) == ["1 \n", "{} \n", '{"a":1} \n']
+        assert pycory.history.PlaydataHistory(directory).lines(1) == ["1 \n", "{} \n", '{"a":2} \n', "{} \n"]
+
+def test_discover():
+    print("\n== discover Test ==\n")
+
+    vdf = pycory.discover.parse_vdf(inspect.cleandoc(
+        """
+        "libraryfolders"
+        {
+            "0"
+            {
+                "path"		"/home/dog/.local/share/Steam"
+                "apps" { "1123450" "123" }
+            }
+            "1"
+            {
+                "path"		"/mnt/games/Steam\\\\Library"
+            }
+        }
+        """
+    ))
+    assert vdf["libraryfolders"]["0"]["path"] == "/home/dog/.local/share/Steam"
+    assert vdf["libraryfolders"]["0"]["apps"] == {"1123450": "123"}
+    assert vdf["libraryfolders"]["1"]["path"] == "/mnt/games/Steam\\Library"
+    old = pycory.discover.parse_vdf('"LibraryFolders"\n{\n\t"TimeNextStatsReport"\t"1"\n\t"1"\t"/mnt/games"\n}')
+    assert old == {"LibraryFolders": {"TimeNextStatsReport": "1", "1": "/mnt/games"}}
+
+    if sys.platform == "linux":
+        environ = {key: os.environ.get(key) for key in ("HOME", "XDG_CACHE_HOME")}
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            os.environ["HOME"] = str(directory / "home")
+            os.environ["XDG_CACHE_HOME"] = str(directory / "cache")
+            pycory.discover._cache.clear()
+            try:
+                root = directory / "home" / ".local" / "share" / "Steam"
+                library = directory / "library"
+                save = library / "steamapps" / "compatdata" / pycory.discover.APP_ID / "pfx" / "drive_c" / "users" / "steamuser" / "AppData" / "Local" / "paintdog" / "save"
+                save.mkdir(parents=True)
+                (root / "steamapps").mkdir(parents=True)
+                with (root / "steamapps" / "libraryfolders.vdf").open("w") as f:
+                    f.write(f'"libraryfolders"\n{{\n\t"0"\n\t{{\n\t\t"path"\t\t"{library}"\n\t}}\n}}\n')
+
+                assert pycory.discover.find_save_location() == save
+                assert pycory.discover._cache["save"] == save
+                (root / "steamapps" / "libraryfolders.vdf").unlink()
+                assert pycory.discover.find_save_location() is pycory.discover._cache["save"] # From memory, nothing is checked
+
+                pycory.discover._cache.clear()
+                assert pycory.discover.find_save_location() == save # From the cache file, the library can't be found anymore
+
+                pycory.discover._cache.clear()
+                save.rmdir()
+                assert pycory.discover.find_save_location() is None # Cache file location is checked before it's used
+                print("Fake Steam library found and cached.")
+            finally:
+                pycory.discover._cache.clear()
+                for key, value in environ.items():
+                    if value is None:
+                        os.environ.pop(key, None)
+                    else:
+                        os.environ[key] = value
+
+    print(f"Steam libraries: {pycory.discover.steam_libraries()}")
+    print(f"Save: {pycory.discover.find_save_location(refresh=True)}")
+    print(f"level_data: {pycory.discover.find_level_data_location(refresh=True)}")
+
+def test_table():
+    print("\n== table Test ==\n")
+
+    decor = pycory.EditDict(True, {
+        "a": {"x": 10, "y": 5, "lvl": "0_1_2", "flip": 0, "time": 30},
+        "b": {"x": 50, "y": 60, "lvl": "0_1_2", "flip": 1, "time": 10},
+        "c": {"x": 5, "y": 5, "lvl": "0_0_0", "flip": 0, "time": 20},
+    })
+    table = pycory.table.RecordTable(decor, index="lvl")
+    assert table.where("0_1_2", sort="time") == ["b", "a"]
+    assert table.range("time", 10, 20) == ["b", "c"]
+    assert table.range("time", 11, None) == ["c", "a"]
+    assert table.range("time", 0, 25, table.where("0_1_2")) == ["b"]
+    assert table.within((0, 20), (0, 10)) == ["c", "a"]
+
+    table.set("a", "x", 10) # Same value, not a change
+    assert table.changed == []
+    table.set("b", "lvl", "0_0_0")
+    assert table.where("0_1_2") == ["a"]
+    assert table.where("0_0_0", sort="time") == ["b", "c"]
+    assert not decor.changed
+    assert table.write_back() == ["b"]
+    assert decor.changed
+    assert dict.__getitem__(decor, "b") == {"x": 50, "y": 60, "lvl": "0_0_0", "flip": 1, "time": 10}
+    assert dict.__getitem__(decor, "a") == {"x": 10, "y": 5, "lvl": "0_1_2", "flip": 0, "time": 30}
+
+    plain = pycory.table.RecordTable({"dog": 1})
+    try:
+        plain.set("dog", "x", 2)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("Setting a field of a non-dict record should raise TypeError")
+
+    save = pycory.path.find_save()
+
+    with save.playdata.open("r") as playdata:
+        decor = pycory.table.decor_table(playdata)
+        screen = "_".join(str(i) for i in playdata.screen)
+        print(f"Decor: {len(decor)}, on {screen}: {decor.where(screen, sort='time')}")
+        print(f"Character states: {len(pycory.table.character_states_table(playdata))}")
+
 tests = {
     "playdata": test_playdata,
     "level_data": test_level_data,
     "geo": test_geo,
+    "geomap": test_geomap,
+    "export": test_export,
+    "import": test_import,
+    "stats": test_stats,
+    "history": test_history,
+    "discover": test_discover,
+    "table": test_table,
 }
 
 def main(args):